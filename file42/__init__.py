@@ -1,23 +1,72 @@
 # for access
+import os
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable
+from typing import Optional
 
 from ._txt import TxtFile
 from ._csv import CsvFile
 from ._py import PyFile
 from ._json import JsonFile
 from ._env import EnvFile
+from ._kv import KvFile
 
 from ._file_abc import FileABC
+from ._watch import Watcher
+from ._utils import (
+    split_compression,
+    copy_file,
+    fingerprint,
+    stat_signature
+)
 
 
-def file(file_name: str) -> FileABC:
-    extension = file_name.split('.')[-1]
+def file(file_name: str, compression_level: Optional[int] = None) -> FileABC:
+    extension = split_compression(file_name)[0].split('.')[-1]  # 'events.csv.gz' is a csv
 
     keys: dict[str, type[FileABC]] = {
         'txt': TxtFile,
         'csv': CsvFile,
         'py': PyFile,
         'json': JsonFile,
-        'env': EnvFile
+        'env': EnvFile,
+        'kv': KvFile,
+        'sqlite': KvFile
     }
 
-    return keys[extension](file_name)
+    return keys[extension](file_name, compression_level)
+
+
+def copy_many(pairs: Iterable[tuple[FileABC | str, FileABC | str]], workers: int = 4) -> list[str]:
+    # the copies run in the kernel and release the GIL, so threads are enough
+    def copy(pair: tuple[FileABC | str, FileABC | str]) -> str:
+        source, destination = pair
+        if isinstance(source, FileABC):
+            return source.duplicate(destination.file if isinstance(destination, FileABC) else destination).file
+        destination_name: str = destination.file if isinstance(destination, FileABC) else destination
+        copy_file(source, destination_name)
+        return destination_name
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(copy, pairs))
+
+
+def find_duplicates(paths: Iterable[FileABC | str]) -> list[list[str]]:
+    # files can only be equal if their sizes are, so only same sized files get hashed
+    by_size: dict[int, list[str]] = {}
+    seen: set[str] = set()
+    for path in paths:
+        name: str = os.path.abspath(path.file if isinstance(path, FileABC) else path)
+        if name in seen or not os.path.isfile(name):
+            continue
+        seen.add(name)
+        by_size.setdefault(stat_signature(name)[2], []).append(name)
+
+    by_digest: dict[tuple[int, str], list[str]] = {}
+    for candidates in by_size.values():
+        if len(candidates) < 2:
+            continue
+        for name in candidates:
+            by_digest.setdefault(fingerprint(name), []).append(name)
+
+    return [group for group in by_digest.values() if len(group) > 1]
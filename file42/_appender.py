@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Optional
+)
+
+if TYPE_CHECKING:
+    from ._file_abc import FileABC
+
+
+class Appender:
+    # one open handle for many writes, the snippets are batched in memory
+    # flushed once buffer_size characters are pending or flush_interval seconds passed
+    # (checked on write, or by a background thread with background=True)
+    # with max_bytes the file is rotated like logging does: file -> file.1 -> file.2 ...
+
+    def __init__(
+            self,
+            file: FileABC,
+            buffer_size: int = 1 << 16,
+            flush_interval: Optional[float] = None,
+            background: bool = False,
+            max_bytes: Optional[int] = None,
+            backup_count: int = 5
+            ) -> None:
+        if background and flush_interval is None:
+            raise ValueError('Appender needs a flush_interval to flush in the background.')
+
+        self.file: FileABC = file
+        self.buffer_size: int = buffer_size
+        self.flush_interval: Optional[float] = flush_interval
+        self.max_bytes: Optional[int] = max_bytes
+        self.backup_count: int = backup_count
+
+        self._pending: list[str] = []
+        self._pending_size: int = 0
+        self._last_flush: float = time.monotonic()
+        self._lock = threading.RLock()
+        self._handle: Optional[IO] = file._open('a')  # NOQA
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(target=self._flush_loop, name='file42-appender', daemon=True)
+            self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._handle is None
+
+    def write(self, *content, **kwargs) -> None:
+        # same arguments as the write of the file
+        text: str = self.file._format_write(*content, **kwargs)  # NOQA
+        with self._lock:
+            if self._handle is None:
+                raise ValueError(f'Write to a closed Appender of {self.file!r}.')
+            self._pending.append(text)
+            self._pending_size += len(text)
+            if self._pending_size >= self.buffer_size or self._interval_passed():
+                self.flush()
+
+    def _interval_passed(self) -> bool:
+        return self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self) -> None:
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending or self._handle is None:
+                return
+            text: str = ''.join(self._pending)
+            self._pending.clear()
+            self._pending_size = 0
+
+            if self.max_bytes is not None and self._should_rotate(len(text)):
+                self._rotate()
+            self.file._append(text, self._handle)  # NOQA
+
+    def _should_rotate(self, incoming: int) -> bool:
+        size: int = self._handle.tell() if self.file.compression is None else os.path.getsize(self.file.file)
+        return size > 0 and size + incoming > self.max_bytes
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        name: str = self.file.file
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.isfile(older := f'{name}.{index}'):
+                    os.replace(older, f'{name}.{index + 1}')
+            os.replace(name, f'{name}.1')
+        self.file.clear()
+        self._handle = self.file._open('a')  # NOQA
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._handle is None:
+                return
+            self.flush()
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> Appender:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}: {self.file.file}'
@@ -1,25 +1,132 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, Optional
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from functools import cache
-
-from ._utils import Matrix
+from itertools import islice, zip_longest, repeat
+import io
+import mmap
+import os
+import re
+
+from ._utils import (
+    Matrix,
+    read_tail,
+    require_module,
+    text_encoding
+)
 
 import csv
-from ._file_abc import FileABC
+from ._file_abc import FileABC, watch_cached
+
+
+class _MatrixReads:
+    # read paths shared by CsvFile and CsvTable, both expose the rows as self.data
+
+    data: Matrix
+
+    @property
+    def header(self) -> list:
+        return self.data[0]
+
+    @staticmethod
+    def _columns_of(data: Matrix) -> list:
+        if not data:
+            return []
+
+        max_length = max(len(row) for row in data)
+        return [
+            [row[index] for row in data if index < len(row)]
+            for index in range(max_length)
+        ]
+
+    @property
+    def columns(self) -> list:
+        return _MatrixReads._columns_of(self.data)
+
+    @property
+    def ratio(self) -> tuple[int, int]:
+        data = self.data
+        return len(data), max((len(row) for row in data), default=0)
+
+    def __getitem__(self, item: str | int | tuple[int, int]) -> Any:
+        data = self.data
+        if isinstance(item, int):
+            return data[item]
+        elif isinstance(item, str):
+            for index, title in enumerate(data[0]):
+                if title == item:
+                    return [row[index] for row in data if index < len(row)]
+        elif isinstance(item, tuple):
+            return data[item[0]][item[1]]
+        raise IndexError(f'Invalid index "{item}" for the {self.__class__.__name__} object ({self!r}).')
+
+    def __contains__(self, item) -> bool:
+        data = self.data
+        return True if item in [*data, *_MatrixReads._columns_of(data)] else item in [value for row in data for value in row]
+
+    def search(self, value_to_search) -> int:
+        return sum(1 for row in self.data for value in row if value == value_to_search)
 
 
-class CsvFile(FileABC):
+class CsvFile(_MatrixReads, FileABC):
 
     @property
+    @watch_cached
     def data(self) -> Matrix:
         # data is process in a different func
         # because the processing can be extensive
         # so to make it faster I used a cache decorated func
-        with open(self.file, 'r') as file:  # when read csv data is all in strings
-            raw_data: list[list[str]] = list(csv.reader(file))
+        with self._rows() as rows:  # when read csv data is all in strings
+            raw_data: list[list[str]] = list(rows)
         hashable_data: tuple[tuple[str, ...], ...] = tuple(tuple(row) for row in raw_data)  # cached funcs strictly use hashable args
         return CsvFile.__process_data(hashable_data)  # said func
 
+    _PARALLEL_MIN_SIZE: int = 1 << 24  # smaller files are parsed faster than a pool starts
+
+    def parse(self, workers: int = 1) -> Matrix:
+        # same result as data, split over workers worker processes by byte ranges
+        # opt in only: a pool needs the if __name__ == '__main__' guard on spawn platforms (Windows, macOS)
+        if workers <= 1 or self.compression is not None or os.path.getsize(self.file) < CsvFile._PARALLEL_MIN_SIZE:
+            return self.data
+
+        # quote counting is cheap but is fooled by literal quotes inside unquoted fields,
+        # the field aware scan is exact but slower, so it only runs when a cut failed
+        for exact in (False, True):
+            ranges = self._byte_ranges(workers, exact)
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:  # chunks come back in order
+                chunks = list(executor.map(
+                    _parse_byte_range,
+                    repeat(self.file), ranges,
+                    [True] + [False] * (len(ranges) - 1),  # header
+                    [True] * (len(ranges) - 1) + [False]  # a next chunk relies on where this one ends
+                ))
+            if all(in_step for _, in_step in chunks):
+                return [row for rows, _ in chunks for row in rows]
+        return self.data
+
+    def _byte_ranges(self, parts: int, exact: bool = False) -> list[tuple[int, int]]:
+        # cuts right after newlines that end a record, see _next_record_count / _next_record_exact
+        next_record = _next_record_exact if exact else _next_record_count
+        with self.mmap() as buffer:
+            size: int = len(buffer)
+            boundaries: list[int] = [0]
+            for part in range(1, parts):
+                position: int = next_record(buffer, boundaries[-1], max(size * part // parts, boundaries[-1]))
+                if position >= size:
+                    break
+                boundaries.append(position)
+            boundaries.append(size)
+        return list(zip(boundaries, boundaries[1:]))
+
+    @contextmanager
+    def _rows(self) -> Iterator[Iterator[list[str]]]:
+        # raw csv rows, line splitting and decoding stay in the C level io stack
+        with self._open('r', newline='') as file:
+            yield csv.reader(file)
+
     @staticmethod
     @cache  # avoid time waste processing already precessed data
     # func used in property data only
@@ -35,73 +142,121 @@ class CsvFile(FileABC):
                 filtered_data.append([value for value in row])
                 continue
 
-            filtered_row = []  # filtered values will be appended here
-            for value in row:
+            filtered_data.append(CsvFile._convert_row(row))  # add to the return matrix the filtered row
 
-                if (lowered_value := value.strip().lower()) in ['', 'none']:
-                    filtered_row.append(None)
-                    continue
+        return filtered_data
 
-                conversion_done_flag: bool = False
-                for conversion_type in {int, float}:  # numerical types
-                    try:
-                        filtered_row.append(conversion_type(value))
-                        conversion_done_flag = True
-                        break
-                    except ValueError:
-                        continue
-                if conversion_done_flag:
-                    continue
+    @staticmethod
+    def _convert_row(row: tuple[str, ...] | list[str]) -> list:
+        filtered_row = []  # filtered values will be appended here
+        for value in row:
+
+            if (lowered_value := value.strip().lower()) in ['', 'none']:
+                filtered_row.append(None)
+                continue
 
-                if lowered_value in {"true", "false"}:  # bool
-                    filtered_row.append(lowered_value == "true")
+            conversion_done_flag: bool = False
+            for conversion_type in (int, float):  # numerical types, int first so ints stay ints
+                try:
+                    filtered_row.append(conversion_type(value))
+                    conversion_done_flag = True
+                    break
+                except ValueError:
                     continue
+            if conversion_done_flag:
+                continue
 
-                filtered_row.append(value)  # is nothing works make it a string
+            if lowered_value in {"true", "false"}:  # bool
+                filtered_row.append(lowered_value == "true")
+                continue
 
-            filtered_data.append(filtered_row)  # add to the return matrix the filtered row
+            filtered_row.append(value)  # is nothing works make it a string
 
-        return filtered_data
+        return filtered_row
 
     @property
     def _content(self) -> Matrix:  # used internally for abc meths
         return self.data
 
-    @property
-    def header(self) -> list:
-        return self.data[0]
-
-    @property
-    def columns(self) -> list:
-        if not self.data:
-            return []
-
-        max_length = max(len(row) for row in self.data)
-        result = [
-            [row[index] for row in self.data if index < len(row)]
-            for index in range(max_length)
-        ]
-        return result
-
-    @property
-    def ratio(self) -> tuple[int, int]:
-        return len(self.data), len(self.columns)
-
     def rewrite(self, content: Matrix):
-        with open(self.file, 'w', newline='') as file:
+        with self._open('w', newline='') as file:
             writer = csv.writer(file)
             writer.writerows(content)
 
     def __str__(self) -> str:
-        col_widths = [max(len(str(item)) for item in col) for col in zip(*self.data)]
+        return CsvFile._render(self.data)
+
+    @staticmethod
+    def _render(rows: Matrix) -> str:
+        # column widths only cover the rows that are shown
+        col_widths = [max(len(str(item)) for item in col) for col in zip_longest(*rows, fillvalue='')]
         result = ''
-        for row in self.data:
+        for row in rows:
             row_str = ''
             for idx, element in enumerate(row):
                 row_str += str(element).ljust(col_widths[idx] + 2)
             result += row_str.rstrip() + '\n'
         return result[:-1]
 
+    def head(self, n: int = 10) -> Matrix:
+        # first n rows (header included) without reading the rest of the file
+        with self._rows() as rows:  # only the first rows are read
+            raw_data = tuple(tuple(row) for row in islice(rows, n))
+        return [list(row) for row in CsvFile.__process_data(raw_data)]
+
+    def tail(self, n: int = 10) -> Matrix:
+        # last n rows, seeks backwards from the end of the file, see _tail_rows
+        if n <= 0:
+            return []
+        raw_data, reaches_header = self._tail_rows(n)
+        reaches_header = reaches_header and len(raw_data) <= n
+        raw_data = raw_data[-n:]
+
+        if reaches_header:  # the header is not type converted
+            return [list(row) for row in CsvFile.__process_data(tuple(tuple(row) for row in raw_data))]
+        processed = CsvFile.__process_data(((),) + tuple(tuple(row) for row in raw_data))
+        return [list(row) for row in processed[1:]]
+
+    def _tail_rows(self, n: int) -> tuple[list[list[str]], bool]:
+        # at least the last n + 1 raw rows (fewer only if the file has fewer), and whether the first is the header
+        # a line starts a record when the quotes from it to the end of the file are even, so the window
+        # is grown until one of its lines does and enough records follow it
+        # literal quotes in unquoted fields (5" disk) break that count, the end marker catches it (see parse)
+        if self.compression is None:
+            lines: int = n + 1
+            while True:
+                pieces, start = read_tail(self.file, lines)
+                parity: int = 0
+                first: Optional[int] = None  # earliest piece that starts a record
+                for index in range(len(pieces) - 1, -1, -1):
+                    parity ^= pieces[index].count(b'"') & 1
+                    if not parity:
+                        first = index
+                if start == 0:  # the whole file is in the window, it starts a record
+                    first = 0
+                if first is not None:
+                    text = '\n'.join(piece.decode(text_encoding()) for piece in pieces[first:])
+                    raw_data = list(csv.reader(io.StringIO(text + '\n' + _END_MARKER + '\n', newline='')))
+                    if not raw_data or raw_data[-1] != [_END_MARKER]:  # the quote count was fooled
+                        break
+                    raw_data = [row for row in raw_data[:-1] if row]
+                    if len(raw_data) > n or (start == 0 and first == 0):
+                        return raw_data, start == 0 and first == 0
+                lines *= 2
+
+        with self._rows() as rows:  # compressed, or quotes the count cannot follow: read forward
+            kept: deque[list[str]] = deque(maxlen=n + 1)
+            count: int = 0
+            for row in rows:
+                if row:
+                    kept.append(row)
+                    count += 1
+        return list(kept), count <= n + 1
+
+    def preview(self, rows: int = 20) -> str:
+        shown = self.head(rows + 1)
+        return CsvFile._render(shown[:rows]) + ('\n...' if len(shown) > rows else '')
+
     def __format__(self, format_spec: str) -> str:
         filtered_format_spec: str = format_spec if not format_spec.endswith('s') else format_spec[:-1]
 
@@ -117,16 +272,173 @@ class CsvFile(FileABC):
                 return value
         raise ValueError(f'Invalid specifier "{format_spec}" for CsvFile.__format__.')
 
-    def __getitem__(self, item: str | int | tuple[int, int]) -> Any:
-        if isinstance(item, int):
-            return self.data[item]
-        elif isinstance(item, str):
-            for index, title in enumerate(self.header):
-                if title == item:
-                    return self.columns[index]
-        elif isinstance(item, tuple):
-            return self.data[item[0]][item[1]]
-        raise IndexError(f'Invalid index "{item}" for the CsvFile object ({self!r}).')
+    def __setitem__(self, key: str | int | tuple[int, int], value: list | Any) -> None:
+        with self.edit() as table:
+            table[key] = value
+
+    @contextmanager
+    def edit(self) -> Iterator[CsvTable]:
+        # one parse on enter, at most one rewrite on exit
+        # nothing is written if the block raises or leaves every row untouched
+        table = CsvTable(self.data)
+        yield table
+        if table.dirty:
+            self.rewrite(table.data)
+
+    def add_row(self, new_row: list, index: int = None) -> None:
+        with self.edit() as table:
+            table.add_row(new_row, index)
+
+    def remove_row(self, index) -> None:
+        with self.edit() as table:
+            table.remove_row(index)
+
+    def add_column(self, new_column: list, index: int = None) -> None:
+        with self.edit() as table:
+            table.add_column(new_column, index)
+
+    def remove_column(self, index) -> None:
+        with self.edit() as table:
+            table.remove_column(index)
+
+    def replace(
+            self,
+            old: Any, new: Any,
+            row_index: int = None,
+            column_index: int = None
+            ) -> None:
+        with self.edit() as table:
+            table.replace(old, new, row_index, column_index)
+
+    def _column_indexes(self, usecols: Iterable[str | int] | None, header: list) -> list[int]:
+        if usecols is None:
+            return list(range(len(header)))
+        indexes = []
+        for column in usecols:
+            if isinstance(column, int):
+                indexes.append(column)
+            elif column in header:
+                indexes.append(header.index(column))
+            else:
+                raise KeyError(f'Column "{column}" not found in {self!r}.')
+        return indexes
+
+    def _typed_columns(self, usecols: Iterable[str | int] | None = None, data: Matrix = None) -> dict[str, list]:
+        # built from the already parsed (and cached) data, no second parse
+        data = data if data is not None else self.data
+        if not data:
+            return {}
+        header = data[0]
+        indexes = self._column_indexes(usecols, header)
+        return {
+            name: [row[index] if index < len(row) else None for row in islice(data, 1, None)]
+            for name, index in zip(CsvFile._unique_names([header[index] for index in indexes]), indexes)
+        }
+
+    @staticmethod
+    def _unique_names(names: list) -> list[str]:
+        # repeated headers are renamed like pandas.read_csv does: a, a.1, a.2
+        unique: list[str] = []
+        taken: set[str] = {str(name) for name in names}
+        counts: dict[str, int] = {}
+        for name in map(str, names):
+            if name not in counts:
+                counts[name] = 0
+                unique.append(name)
+                continue
+            while f'{name}.{counts[name] + 1}' in taken:
+                counts[name] += 1
+            counts[name] += 1
+            taken.add(renamed := f'{name}.{counts[name]}')
+            unique.append(renamed)
+        return unique
+
+    def to_columns(self, workers: int = 1, usecols: Iterable[str | int] | None = None) -> dict[str, list]:
+        # header -> typed column, parsed with parse(workers)
+        return self._typed_columns(usecols, self.parse(workers))
+
+    @staticmethod
+    def _common_dtype(values: list) -> type:
+        kinds = {type(value) for value in values if value is not None}
+        if not kinds or kinds - {int, float, bool} or (bool in kinds and len(kinds) > 1):
+            return object
+        if None in values:
+            return float if kinds <= {int, float} else object  # numpy has no null int/bool
+        return float if float in kinds else kinds.pop()
+
+    def to_numpy(self, usecols: Iterable[str | int] | None = None, dtype: Any = None):
+        numpy = require_module('numpy', 'CsvFile.to_numpy')
+        columns = self._typed_columns(usecols)
+        values = [value for column in columns.values() for value in column]
+        if dtype is None:
+            dtype = CsvFile._common_dtype(values)
+        array = numpy.array([list(row) for row in zip(*columns.values())], dtype=dtype)
+        return array.reshape(len(array), len(columns))
+
+    def to_pandas(
+            self,
+            usecols: Iterable[str | int] | None = None,
+            dtype: Any = None,
+            chunksize: int | None = None
+            ):
+        pandas = require_module('pandas', 'CsvFile.to_pandas')
+
+        if chunksize is None:
+            frame = pandas.DataFrame(self._typed_columns(usecols))
+            return frame if dtype is None else frame.astype(dtype)
+
+        return self._iter_frames(pandas, usecols, dtype, chunksize)
+
+    def _iter_frames(self, pandas, usecols, dtype, chunksize: int) -> Iterator:
+        # streaming variant: only the selected fields of each row are converted
+        with self._rows() as reader:
+            header = next(reader, [])
+            indexes = self._column_indexes(usecols, header)
+            names = CsvFile._unique_names([header[index] for index in indexes])
+            while chunk := list(islice(reader, chunksize)):
+                rows = [CsvFile._convert_row([row[index] if index < len(row) else '' for index in indexes]) for row in chunk]
+                frame = pandas.DataFrame(rows, columns=names)
+                yield frame if dtype is None else frame.astype(dtype)
+
+    def to_arrow(self, usecols: Iterable[str | int] | None = None):
+        pyarrow = require_module('pyarrow', 'CsvFile.to_arrow')
+        return pyarrow.table(self._typed_columns(usecols))
+
+    @property
+    def pandas(self):
+        return self.to_pandas()
+
+
+class CsvTable(_MatrixReads):
+    # materialized, mutable view of a CsvFile handed out by CsvFile.edit
+    # mutations only touch memory, the rows they change are tracked as dirty
+
+    def __init__(self, data: Matrix) -> None:
+        self.data: Matrix = [list(row) for row in data]  # copy, CsvFile.data may come from a cache
+        self._dirty_rows: set[int] = set()
+        self._reshaped: bool = False  # rows or columns added / removed
+
+    @property
+    def dirty(self) -> bool:
+        return self._reshaped or bool(self._dirty_rows)
+
+    @property
+    def dirty_rows(self) -> frozenset[int]:
+        return frozenset(self._dirty_rows)
+
+    def _mark(self, row_index: int) -> None:
+        self._dirty_rows.add(row_index % len(self.data))
+
+    @staticmethod
+    def _changes(old: Any, new: Any) -> bool:
+        # 1 == True == 1.0, but each one is written differently
+        return type(old) is not type(new) or old != new
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[list]:
+        return iter(self.data)
 
     def __setitem__(self, key: str | int | tuple[int, int], value: list | Any) -> None:
         temp_data: Matrix = self.data
@@ -138,7 +450,8 @@ class CsvFile(FileABC):
                 raise ValueError("Value must be a list when replacing a row.")
             if len(value) != len(temp_data[0]):
                 raise ValueError(f"Row length mismatch: expected {len(temp_data[0])}, got {len(value)}.")
-            temp_data[key] = value
+            temp_data[key] = list(value)
+            self._mark(key)
 
         elif isinstance(key, str):  # column
             try:
@@ -150,7 +463,9 @@ class CsvFile(FileABC):
             if len(value) != len(temp_data):
                 raise ValueError(f"Column length mismatch: expected {len(temp_data)}, got {len(value)}.")
             for row_idx, val in enumerate(value):
-                temp_data[row_idx][col_index] = val
+                if CsvTable._changes(temp_data[row_idx][col_index], val):
+                    temp_data[row_idx][col_index] = val
+                    self._mark(row_idx)
 
         elif isinstance(key, tuple):  # value
             row_idx, col_idx = key
@@ -158,50 +473,43 @@ class CsvFile(FileABC):
                 raise IndexError(f"Row index {row_idx} out of range.")
             if not (0 <= col_idx < len(temp_data[row_idx])):
                 raise IndexError(f"Column index {col_idx} out of range.")
-            temp_data[row_idx][col_idx] = value
+            if CsvTable._changes(temp_data[row_idx][col_idx], value):
+                temp_data[row_idx][col_idx] = value
+                self._mark(row_idx)
 
         else:
             raise TypeError(f"Key of type {type(key).__name__} is not supported for __setitem__.")
 
-        self.rewrite(temp_data)
-
-    def __contains__(self, item) -> bool:
-        return True if item in [*self.data, *self.columns] else item in [value for row in self.data for value in row]
-
     def add_row(self, new_row: list, index: int = None) -> None:
-        new_data: Matrix = self.data
-
         if len(new_row) != self.ratio[1]:
             raise ValueError('The length of the new row must be the same as the one of the other rows.')
 
         if index is None:
-            new_data.append(new_row)
+            self.data.append(list(new_row))
         else:
-            new_data.insert(index, new_row)
-
-        self.rewrite(new_data)
+            self.data.insert(index, list(new_row))
+        self._reshaped = True
 
     def remove_row(self, index) -> None:
-        self.rewrite(self.data.pop(index))
+        self.data.pop(index)
+        self._reshaped = True
 
     def add_column(self, new_column: list, index: int = None) -> None:
-        new_columns = self.columns
-
         if len(new_column) != self.ratio[0]:
             raise ValueError('The length of the new column must be the same as the one of the other columns.')
 
-        if index is None:
-            new_columns.append(new_column)
-        else:
-            new_columns.insert(index, new_column)
-
-        new_data = [list(row) for row in zip(*new_columns)]
-        self.rewrite(new_data)
+        for row, value in zip(self.data, new_column):  # in place, no transposing
+            if index is None:
+                row.append(value)
+            else:
+                row.insert(index, value)
+        self._reshaped = True
 
     def remove_column(self, index) -> None:
-        new_columns = self.columns.pop(index)
-        new_data = [list(row) for row in zip(*new_columns)]
-        self.rewrite(new_data)
+        for row in self.data:
+            if -len(row) <= index < len(row):
+                row.pop(index)
+        self._reshaped = True
 
     def replace(
             self,
@@ -211,55 +519,84 @@ class CsvFile(FileABC):
             ) -> None:
 
         if row_index == 0:
-            raise IndexError('CsvFile.replace cannot take 0 as the row index since row 0 is the header.')
+            raise IndexError('CsvTable.replace cannot take 0 as the row index since row 0 is the header.')
 
-        new_data = self.data
         rows, cols = self.ratio
 
         if row_index is None and column_index is None:  # all values
-            for row_idx in range(1, rows):  # don't change header
-                new_data[row_idx] = [
-                    new if value == old else value for value in new_data[row_idx]
-                ]
+            targets = [(row_idx, col_idx) for row_idx in range(1, rows) for col_idx in range(len(self.data[row_idx]))]
 
         elif column_index is None:  # row
             if not (1 <= row_index < rows):
                 raise IndexError(f"Row index out of range. Must be between 1 and {rows - 1}.")
-            new_data[row_index] = [
-                new if value == old else value for value in new_data[row_index]
-            ]
+            targets = [(row_index, col_idx) for col_idx in range(len(self.data[row_index]))]
 
         elif row_index is None:  # column
             if not (0 <= column_index < cols):
                 raise IndexError(f"Column index out of range. Must be between 0 and {cols - 1}.")
-            for row_idx in range(1, rows):  # don't change header
-                if new_data[row_idx][column_index] == old:
-                    new_data[row_idx][column_index] = new
+            targets = [(row_idx, column_index) for row_idx in range(1, rows) if column_index < len(self.data[row_idx])]
 
         else:  # specific value
             if not (1 <= row_index < rows) or not (0 <= column_index < cols):
                 raise IndexError(f"Row or column index out of range.")
-            if new_data[row_index][column_index] == old:
-                new_data[row_index][column_index] = new
-
-        self.rewrite(new_data)
-
-    def search(self, value_to_search) -> int:
-        counter: int = 0
-
-        for row in self.data:
-            for value in row:
-                if value == value_to_search:
-                    counter += 1
-
-        return counter
-
-    @property
-    def pandas(self):
-        try:
-            import pandas
-            return pandas.read_csv(self.file)
-        except ModuleNotFoundError:
-            raise ImportError("Pandas is not installed, therefore the CsvFile.pandas function failed.")
-        finally:
-            del pandas
+            targets = [(row_index, column_index)]
+
+        for row_idx, col_idx in targets:
+            if self.data[row_idx][col_idx] == old and CsvTable._changes(self.data[row_idx][col_idx], new):
+                self.data[row_idx][col_idx] = new
+                self._mark(row_idx)
+
+
+_FIELD_QUOTE = re.compile(rb'(?:^|(?<=,))"', re.MULTILINE)  # a quote that opens a field
+_QUOTED_REST = re.compile(rb'[^"]*(?:""[^"]*)*"')  # rest of a quoted field, "" escapes included
+_END_MARKER: str = '\x00file42-end\x00'
+
+
+def _count_quotes(buffer, start: int, end: int, block_size: int = 1 << 24) -> int:
+    return sum(buffer[index:min(index + block_size, end)].count(b'"') for index in range(start, end, block_size))
+
+
+def _next_record_count(buffer, boundary: int, target: int) -> int:
+    # a newline is inside a quoted field when an odd number of quotes came before it since boundary
+    # wrong when unquoted fields hold literal quotes (5" disk), the workers catch that
+    parity: int = _count_quotes(buffer, boundary, target) % 2
+    position: int = target
+    while (newline := buffer.find(b'\n', position)) != -1:
+        parity = (parity + _count_quotes(buffer, position, newline)) % 2
+        position = newline + 1
+        if not parity:
+            return position
+    return len(buffer)
+
+
+def _next_record_exact(buffer, boundary: int, target: int) -> int:
+    # walks the quoted fields from boundary (a record start), only quotes opening a field count
+    position: int = boundary
+    while True:
+        newline = buffer.find(b'\n', max(position, target))
+        if newline == -1:
+            return len(buffer)
+        opening = _FIELD_QUOTE.search(buffer, position, newline)
+        if opening is None:
+            return newline + 1
+        if (closing := _QUOTED_REST.match(buffer, opening.end())) is None:  # unterminated, one chunk
+            return len(buffer)
+        position = closing.end()
+
+
+def _parse_byte_range(file: str, byte_range: tuple[int, int], has_header: bool, check_end: bool) -> tuple[Matrix, bool]:
+    # runs in a worker process, only the path and the offsets are pickled in
+    # returns the rows and whether the range ended outside of a quoted field, i.e. the next cut is a record start
+    start, end = byte_range
+    with open(file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        text: str = buffer[start:end].decode(text_encoding())
+
+    raw_rows = list(csv.reader(io.StringIO(text + _END_MARKER + '\n' if check_end else text, newline='')))
+    if check_end:
+        if not raw_rows or raw_rows[-1] != [_END_MARKER]:  # the marker got swallowed by an open quoted field
+            return [], False
+        raw_rows.pop()
+
+    if has_header and raw_rows:
+        return [raw_rows[0]] + [CsvFile._convert_row(row) for row in raw_rows[1:]], True
+    return [CsvFile._convert_row(row) for row in raw_rows], True
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from functools import cache
-from typing import Any
+from typing import Any, Optional
 
-from ._file_abc import DictLikeFileABC
+from ._file_abc import DictLikeFileABC, watch_cached
 from ._utils import base_value
 
 # try:
@@ -15,12 +15,13 @@ from ._utils import base_value
 
 class EnvFile(DictLikeFileABC):
 
-    def __init__(self, file: str = '') -> None:
-        super().__init__(file)
+    def __init__(self, file: str = '', compression_level: Optional[int] = None) -> None:
+        super().__init__(file, compression_level)
 
     @property
+    @watch_cached
     def variables(self) -> dict[str, Any]:
-        with open(self.file, 'r') as file:
+        with self._open('r') as file:
             return EnvFile._find_variables(file.read())
 
     @staticmethod
@@ -36,10 +37,11 @@ class EnvFile(DictLikeFileABC):
 
         return variables
 
+    @property
     def _content(self):
         return self.variables
 
     def rewrite(self, **variables) -> None:
         data = '\n'.join([f'{var!s}={value!s}' for var, value in variables.items()])
-        with open(self.file, 'w') as file:
+        with self._open('w') as file:
             file.write(data)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 import os
+import re
+import shutil
+import mmap as _mmap
 from abc import (
     ABC,
     ABCMeta,
@@ -7,21 +10,72 @@ from abc import (
 )
 from pathlib import Path
 from typing import (
+    IO,
     TextIO,
     Optional,
     Any,
     Callable,
-    NoReturn
+    NoReturn,
+    TYPE_CHECKING
 )
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from copy import deepcopy
 from functools import wraps, cache
 
 from ._utils import (
     raise_if,
     applied,
-    pformat_return
+    pformat_return,
+    split_compression,
+    compression_suffix,
+    open_file,
+    ReplacingFile,
+    copy_file,
+    Fingerprint,
+    fingerprint,
+    cached_fingerprint
 )
 
+from ._appender import Appender
+
+if TYPE_CHECKING:
+    from ._watch import Watcher, WatchCallback
+
+
+_CACHE_INVALIDATING: tuple[str, ...] = ('rewrite', 'write', '_append', 'clear', 'delete')  # meths that change the file
+
+
+def _invalidates_cache(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self: FileABC, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._invalidate()
+    return wrapper
+
+
+def watch_cached(func: Callable) -> Callable:
+    # content readers are only cached while a Watcher keeps the handle up to date
+    # unwatched handles keep re-reading the file on every access
+    # the cached object is shared like the cache of CsvFile.data / EnvFile.variables,
+    # the mutators of the files edit a copy of it (see CsvTable and DictLikeFileABC._editable_content)
+    @wraps(func)
+    def wrapper(self: FileABC):
+        if not self._watchers:
+            return func(self)
+        try:
+            return self._content_cache[func.__name__]
+        except KeyError:
+            pass
+        generation: int = self._cache_generation
+        value = func(self)
+        if generation == self._cache_generation:  # not invalidated while reading
+            self._content_cache[func.__name__] = value
+        return value
+    return wrapper
+
 
 class _FileABCMeta(ABCMeta):
     def __new__(
@@ -39,6 +93,9 @@ class _FileABCMeta(ABCMeta):
         else:
             extension = ''
         namespace['extension'] = extension
+        for meth_name in _CACHE_INVALIDATING:
+            if callable(namespace.get(meth_name)):
+                namespace[meth_name] = _invalidates_cache(namespace[meth_name])
         return super().__new__(cls, name, bases, namespace)
 
 
@@ -48,15 +105,22 @@ class FileABC(
     file_like=False
 ):
 
-    def __init__(self, file: str) -> None:
+    other_extensions: tuple[str, ...] = ()  # also accepted as is, e.g. '.sqlite' for KvFile
 
-        if not file.endswith(self.extension):  # NOQA
-            self._file = file + f'{self.extension}'
-        else:
-            self._file = file
+    def __init__(self, file: str, compression_level: Optional[int] = None) -> None:
+        self._watchers: set[Watcher] = set()
+        self._content_cache: dict[str, Any] = {}
+        self._cache_generation: int = 0
+
+        # compound extensions, e.g. 'events.csv.gz' is a gzip compressed CsvFile
+        base_name, self.compression = split_compression(file)
+        self.compression_level: Optional[int] = compression_level
+        if not base_name.endswith((self.extension, *self.other_extensions)):  # NOQA
+            base_name += f'{self.extension}'  # NOQA
+        self._file = base_name + compression_suffix(self.compression)
 
         if not os.path.isfile(self.file):
-            with open(self._file, 'w'):
+            with self._open('w'):
                 pass
 
         self.__is_open: bool = False
@@ -67,11 +131,41 @@ class FileABC(
     def path(self):
         return Path(self.file)
 
+    def _open(self, mode: str = 'r', **kwargs) -> IO:
+        # every read / write goes through here so compressed files are handled transparently
+        # 'w' writes a new file that replaces this one on close, so it is never truncated under a reader (see mmap)
+        if 'w' in mode:
+            return ReplacingFile(  # NOQA  quacks like the handle it wraps
+                self.file, lambda file: open_file(file, mode, self.compression, self.compression_level, **kwargs)
+            )
+        return open_file(self.file, mode, self.compression, self.compression_level, **kwargs)
+
     def open(self, mode: str = 'r') -> TextIO:
-        self.__file_state = open(self.file, mode)
+        self.__file_state = self._open(mode)
         self.__is_open = True
         return self.__file_state
 
+    def read_bytes(self) -> bytes:
+        with self._open('rb') as file:  # decompressed content for compressed files
+            return file.read()
+
+    @contextmanager
+    def mmap(self) -> Iterator[_mmap.mmap | bytes]:
+        # read-only map of the whole file, shared with the page cache instead of copied
+        # file42 only replaces or appends to files, a mapping keeps seeing the old content of a rewritten file,
+        # but a file truncated by another program kills the process (SIGBUS) when the lost pages are read
+        # empty files cannot be mapped, those give b''
+        # compressed files cannot be mapped either, those give their decompressed bytes
+        if self.compression is not None:
+            yield self.read_bytes()
+            return
+        with open(self.file, 'rb') as file:
+            if not os.fstat(file.fileno()).st_size:
+                yield b''
+                return
+            with _mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ) as buffer:
+                yield buffer
+
     def close(self) -> None | NoReturn:
         if self.__file_state is None:
             raise RuntimeError(f'Closing of {self.__class__}({self.file}) failed because it was not open.')
@@ -88,6 +182,34 @@ class FileABC(
     def file(self):
         return self._file
 
+    def watch(
+            self,
+            callback: Optional[WatchCallback] = None,
+            watcher: Optional[Watcher] = None
+            ) -> Watcher:
+        # while watched, parsed content is kept in memory and dropped on every change event
+        from ._watch import Watcher
+        (watcher := watcher if watcher is not None else Watcher.default()).add(self, callback)
+        return watcher
+
+    def unwatch(self, watcher: Optional[Watcher] = None) -> None:
+        for watching in [watcher] if watcher is not None else list(self._watchers):
+            watching.remove(self)
+
+    @property
+    def is_watched(self) -> bool:
+        return bool(self._watchers)
+
+    def _invalidate(self) -> None:
+        self._cache_generation += 1
+        self._content_cache.clear()
+
+    def _reload(self) -> None:
+        try:
+            self._content  # NOQA  refills the cache
+        except (OSError, ValueError):  # gone or mid-write, the next access reads it again
+            pass
+
     @property
     @abstractmethod
     def _content(self):  # used for iternal processes
@@ -104,22 +226,66 @@ class FileABC(
         return file
 
     def clear(self) -> None:
-        with open(self.file, 'w'):
+        with self._open('w'):
             pass
 
+    def _format_write(self, *content, **kwargs) -> str:  # what write appends, for files that have one
+        raise TypeError(f'{self.__class__.__name__} has no write to buffer.')
+
+    def appender(
+            self,
+            buffer_size: int = 1 << 16,
+            flush_interval: Optional[float] = None,
+            background: bool = False,
+            max_bytes: Optional[int] = None,
+            backup_count: int = 5
+            ) -> Appender:
+        # with file.appender() as a: a.write(...) -- same arguments as the write of the file, one open handle
+        if type(self)._format_write is FileABC._format_write:  # fail early for files without a write
+            raise TypeError(f'{self.__class__.__name__} has no write to buffer.')
+        return Appender(self, buffer_size, flush_interval, background, max_bytes, backup_count)
+
+    def _append(self, text: str, handle: Optional[IO] = None) -> None:
+        # end of every write, handle is the one kept open by an Appender
+        if handle is None:
+            with self._open('a') as file:
+                file.write(text)
+        else:
+            handle.write(text)
+            handle.flush()
+
     def __str__(self) -> str:
         return str(self._content)
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}: {self.file}'
 
+    def fingerprint(self) -> Fingerprint:
+        # size and digest of the stored bytes, recomputed only when the stat signature changes
+        return fingerprint(self.file)
+
+    def same_content(self, other: FileABC) -> bool:
+        if self.compression != other.compression:  # stored bytes differ anyway
+            return self.read_bytes() == other.read_bytes()
+        if os.path.getsize(self.file) != os.path.getsize(other.file):  # cheapest check first
+            return False
+        return self.fingerprint() == other.fingerprint()
+
+    def _known_same_content(self, other: FileABC) -> bool:
+        # same_content from already cached fingerprints only, ordering must not hash both files first
+        if self.compression != other.compression:
+            return False
+        known = cached_fingerprint(self.file)
+        return known is not None and known == cached_fingerprint(other.file)
+
     def __bool__(self) -> bool:
+        if self.compression is None and not os.path.getsize(self.file):  # empty file, nothing to parse
+            return False
         return True if self._content else False
 
-    def __eq__(self, other) -> bool:
+    def __eq__(self, other) -> bool:  # same file, use same_content to compare contents
         if isinstance(other, self.__class__):
-            if self.__class__ == other.file:
-                return True
+            return os.path.abspath(self.file) == os.path.abspath(other.file)
         return False
 
     def __ne__(self, other) -> bool:
@@ -127,12 +293,12 @@ class FileABC(
 
     def __gt__(self, other) -> bool:
         if isinstance(other, self.__class__):
-            return self._content > other._content
+            return not self._known_same_content(other) and self._content > other._content
         return False
 
     def __lt__(self, other) -> bool:
         if isinstance(other, self.__class__):
-            return self._content < other._content
+            return not self._known_same_content(other) and self._content < other._content
         return False
 
     def __ge__(self, other) -> bool:
@@ -142,28 +308,52 @@ class FileABC(
         return not (self > other)
 
     def __len__(self) -> int:
+        if self.compression is None and not os.path.getsize(self.file):  # empty file, nothing to parse
+            return 0
         return len(self._content)
 
     def __iter__(self) -> Iterable:
         return iter(self._content)
 
     def __hash__(self) -> int:
-        return hash((self.__class__, self.file))
+        return hash((self.__class__, os.path.abspath(self.file)))
 
     def delete(self) -> None:
         os.remove(self.file)
         del self
 
+    def _free_copy_name(self) -> str:
+        # 'data.csv' -> 'data(n).csv' with the lowest unused n, one directory listing instead of a stat per copy
+        directory, name = os.path.split(self.file)
+        compressed: str = compression_suffix(self.compression)
+        suffix: str = next(  # whichever accepted extension the name really has
+            extension + compressed for extension in (self.extension, *self.other_extensions)  # NOQA
+            if name.endswith(extension + compressed)
+        )
+        stem: str = name[:-len(suffix)] if suffix else name
+        pattern = re.compile(rf'{re.escape(stem)}\((\d+)\){re.escape(suffix)}')
+        taken: set[int] = {
+            int(match.group(1)) for entry in os.listdir(directory or '.')
+            if (match := pattern.fullmatch(entry))
+        }
+        version: int = 0
+        while version in taken:
+            version += 1
+        return os.path.join(directory, f'{stem}({version}){suffix}')
+
     def duplicate(self, new_file_name: str = None) -> FileABC:
-        filtered_new_file_name: str = new_file_name
-        if new_file_name is not None:
-            version: int = 0
-            while True:
-                if not os.path.isfile(filtered_new_file_name := f'{self.file.split('.')[0]}({version}){self.extension}'):
-                    break
-                version += 1
-
-        (new_file := self.__class__(filtered_new_file_name)).rewrite(self._content)
+        filtered_new_file_name: str = new_file_name if new_file_name is not None else self._free_copy_name()
+        new_file = self.__class__(filtered_new_file_name, compression_level=self.compression_level)
+
+        if os.path.samefile(self.file, new_file.file):
+            return new_file
+
+        if new_file.compression == self.compression:  # raw bytes, nothing is parsed
+            copy_file(self.file, new_file.file)
+        else:  # recompressed on the fly, still without parsing
+            with self._open('rb') as source, new_file._open('wb') as destination:
+                shutil.copyfileobj(source, destination)
+        new_file._invalidate()
         return new_file
 
     def copy_to(self, file_to_copy_to: FileABC | str) -> None:
@@ -171,6 +361,7 @@ class FileABC(
             self.duplicate(file_to_copy_to)
         elif isinstance(file_to_copy_to, self.__class__):
             self.duplicate(file_to_copy_to.file)
+            file_to_copy_to._invalidate()
 
 
 class DictLikeFileABC(
@@ -201,8 +392,12 @@ class DictLikeFileABC(
     def items(self):
         return self._content
 
+    def _editable_content(self) -> dict:
+        # the content of a watched handle is the cached object, edits must not reach it before the rewrite
+        return deepcopy(self._content) if self._watchers else self._content
+
     def remove(self, key: str) -> None:
-        content = self._content
+        content = self._editable_content()
         if key in content:
             del content[key]
             self.rewrite(content)
@@ -215,7 +410,7 @@ class DictLikeFileABC(
         return self._content, item, subs_value
 
     def __setitem__(self, key: str, value: Any) -> None:
-        (temp_data := self._content)[key] = value
+        (temp_data := self._editable_content())[key] = value
         self.rewrite(temp_data)
 
     def __iter__(self):
@@ -226,7 +421,7 @@ class DictLikeFileABC(
         def decorator(func: Callable) -> Callable:
             @wraps(func)
             def wrapper(self: DictLikeFileABC, *args, **kwargs):
-                temp_data = self._content
+                temp_data = self._editable_content()
                 value = applied_func(temp_data, *args, **kwargs)
                 self.rewrite(temp_data)
                 return value
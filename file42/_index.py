@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Optional
+
+from ._utils import read_tail
+
+
+Signature = tuple[int, int]  # size, mtime of the indexed file
+Postings = dict[str, list[int]]  # word -> sorted line numbers
+
+_WORD = re.compile(r'\w+')
+
+
+class WordIndex:
+    # word -> sorted line numbers of a text, lines as in TxtFile.lines
+    # stored as a JSON lines sidecar: one full record, then one delta record per append
+    # a delta record carries the postings it adds and the ones of the continued last line it drops
+    # once COMPACT_AFTER deltas piled up they are merged back into a single full record
+
+    COMPACT_AFTER: int = 64
+
+    def __init__(
+            self,
+            postings: Postings,
+            n_lines: int,
+            tail: str,
+            signature: Signature,
+            deltas: int = 0
+            ) -> None:
+        self.postings: Postings = postings
+        self.n_lines: int = n_lines  # len(text.split('\n'))
+        self.tail: str = tail  # the last, possibly unfinished, line
+        self.signature: Signature = signature
+        self.deltas: int = deltas  # delta records after the full one in the sidecar
+
+    @staticmethod
+    def tokenize(text: str) -> set[str]:
+        return {word.lower() for word in _WORD.findall(text)}
+
+    @staticmethod
+    def _merge(postings: Postings, added: Postings, dropped: Optional[Postings] = None) -> None:
+        # dropped lines are always the last line of their words, the one an append continued
+        for word, lines in (dropped or {}).items():
+            current = postings.get(word, [])
+            for line in lines:
+                if current and current[-1] == line:
+                    current.pop()
+            if not current:
+                postings.pop(word, None)
+        for word, lines in added.items():
+            postings.setdefault(word, []).extend(lines)
+
+    @classmethod
+    def build(cls, text: str, signature: Signature) -> WordIndex:
+        index = cls({}, 1, '', signature)
+        index.extend(text)
+        return index
+
+    def extend(self, appended: str) -> tuple[Postings, Postings]:
+        # only the appended text (and the unfinished last line) is tokenized
+        # the last line is indexed again as a whole, so its old words are dropped first
+        # returns the added and the dropped postings
+        first_line = self.n_lines - 1
+        dropped: Postings = {word: [first_line] for word in WordIndex.tokenize(self.tail)}
+        added: Postings = {}
+        pieces = (self.tail + appended).split('\n')
+        for offset, line in enumerate(pieces):
+            for word in WordIndex.tokenize(line):
+                added.setdefault(word, []).append(first_line + offset)
+
+        WordIndex._merge(self.postings, added, dropped)
+        self.n_lines = first_line + len(pieces)
+        self.tail = pieces[-1]
+        return added, dropped
+
+    def lines_of(self, word: str) -> list[int]:
+        return self.postings.get(word.lower(), [])
+
+    # sidecar
+
+    def _record(self, postings: Postings, dropped: Optional[Postings] = None) -> str:
+        return json.dumps({
+            'signature': self.signature,
+            'n_lines': self.n_lines,
+            'tail': self.tail,
+            'deltas': self.deltas,
+            'postings': postings,
+            'dropped': dropped or {}
+        }) + '\n'
+
+    def save(self, index_file: str) -> None:
+        self.deltas = 0
+        with open(index_file, 'w') as file:
+            file.write(self._record(self.postings))
+
+    def save_delta(self, index_file: str, delta: tuple[Postings, Postings]) -> None:
+        self.deltas += 1
+        with open(index_file, 'a') as file:
+            file.write(self._record(*delta))
+
+    @classmethod
+    def load(cls, index_file: str, signature: Signature) -> Optional[WordIndex]:
+        # None when there is no sidecar or it does not describe the file as it is now
+        state = cls.load_state(index_file)
+        if state is None or state.signature != signature:
+            return None
+
+        postings: Postings = {}
+        with open(index_file, 'r') as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    WordIndex._merge(postings, record['postings'], record.get('dropped'))
+        state.postings = postings
+        if state.deltas >= WordIndex.COMPACT_AFTER:
+            state.save(index_file)
+        return state
+
+    @classmethod
+    def load_state(cls, index_file: str) -> Optional[WordIndex]:
+        # line count and tail from the last record only, postings are left empty
+        if not os.path.isfile(index_file):
+            return None
+        pieces, _ = read_tail(index_file, 2)
+        records = [piece for piece in pieces if piece.strip()]
+        if not records:
+            return None
+        try:
+            record = json.loads(records[-1])
+        except json.JSONDecodeError:  # torn write
+            return None
+        return cls({}, record['n_lines'], record['tail'], tuple(record['signature']), record.get('deltas', 0))
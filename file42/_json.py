@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-from ._file_abc import DictLikeFileABC
+from ._file_abc import DictLikeFileABC, watch_cached
+from ._jsonpath import (
+    PathPart,
+    MemberCursor,
+    parse_path,
+    locate,
+    decode_value,
+    open_members,
+    read_members,
+    is_blank,
+    NOT_A_CONTAINER
+)
+from ._utils import Null, stat_signature
 
 import json
-from typing import Any
+from collections.abc import Iterator
+from contextlib import nullcontext
+from typing import Any, Optional
 
 
 class JsonFile(DictLikeFileABC):
 
+    _ITER_BATCH_BYTES: int = 1 << 20  # iter_items decodes about this much of the document per mapping
+
     @property
+    @watch_cached
     def data(self) -> dict[str, Any]:
         try:
-            with open(self.file, 'r') as file:
-                return json.load(file)
-        except (json.JSONDecodeError, FileNotFoundError):
+            return json.loads(self.read_bytes())  # json detects the encoding of the raw bytes itself
+        except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError):
             return {}
 
     @property
@@ -21,5 +37,67 @@ class JsonFile(DictLikeFileABC):
         return self.data
 
     def rewrite(self, content: Any) -> None:
-        with open(self.file, 'w') as file:
+        with self._open('w') as file:
             json.dump(content, file, indent=4)
+
+    def _cached_data(self) -> Any:
+        # a watched handle that already parsed the document answers from memory
+        # (the values are shared with the cache, like watch_cached does)
+        return self._content_cache.get('data', Null) if self._watchers else Null
+
+    def get_path(self, path: str, default: Any = Null) -> Any:
+        # jf.get_path('a.b[3].c'), only the value at the path is built
+        parts: list[PathPart] = parse_path(path)
+        try:
+            if (data := self._cached_data()) is not Null:
+                for part in parts:
+                    data = data[part]
+                return data
+
+            with self.mmap() as buffer:
+                if is_blank(buffer):  # same as an empty document for JsonFile.data
+                    raise KeyError(path)
+                return decode_value(buffer, locate(buffer, parts))[0]
+        except (KeyError, IndexError, TypeError, json.JSONDecodeError):  # malformed reads like JsonFile.data: empty
+            if default is Null:
+                raise KeyError(f'Path "{path}" not found in {self!r}.') from None
+            return default
+
+    def iter_items(self, prefix: str = '') -> Iterator[tuple[PathPart, Any]]:
+        # (key, value) of the object at prefix, or (index, value) of the array, one batch of values in memory at a time
+        parts: list[PathPart] = parse_path(prefix)
+        if (data := self._cached_data()) is not Null:
+            for part in parts:
+                data = data[part]
+            if not isinstance(data, (dict, list)):  # same as the streaming path
+                raise TypeError(NOT_A_CONTAINER)
+            yield from data.items() if isinstance(data, dict) else enumerate(data)
+            return
+
+        # read in batches, each from a fresh short-lived mapping that is never held while the caller runs
+        signature = stat_signature(self.file)
+        compressed: Any = self.read_bytes() if self.compression is not None else None  # decompressed once
+        cursor: Optional[MemberCursor] = None
+        first: bool = True
+        while True:
+            with self.mmap() if compressed is None else nullcontext(compressed) as buffer:
+                if stat_signature(self.file) != signature:
+                    raise RuntimeError(f'{self!r} changed while iterating over it.')
+                try:
+                    if cursor is None:  # first batch, nothing was handed out yet
+                        if is_blank(buffer):
+                            raise json.JSONDecodeError('Expecting value', '', 0)
+                        cursor = open_members(buffer, locate(buffer, parts))
+                    members, cursor = read_members(buffer, cursor, JsonFile._ITER_BATCH_BYTES)
+                except json.JSONDecodeError:
+                    if not first:  # the document broke after items were handed out
+                        raise
+                    if parts:  # malformed reads like JsonFile.data: empty
+                        raise KeyError(f'Path "{prefix}" not found in {self!r}.') from None
+                    return
+                except (KeyError, IndexError):
+                    raise KeyError(f'Path "{prefix}" not found in {self!r}.') from None
+            yield from members
+            if cursor is None:
+                return
+            first = False
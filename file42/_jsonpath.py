@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, Optional
+
+# incremental scanning of JSON held in a bytes-like buffer (an mmap included)
+# values off the path are skipped by bracket matching, only the values asked for are decoded
+
+PathPart = str | int
+
+NOT_A_CONTAINER: str = 'The value at this path is not an object or an array.'
+
+_PATH_PART = re.compile(r'\[(\d+)\]|\["((?:[^"\\]|\\.)*)"\]|\.?([^.\[\]]+)')
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING_PATTERN: bytes = rb'"(?:[^"\\]++|\\.)*+"'
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+_SCALAR = re.compile(rb'[^,\]}\s]+')
+_NESTING: int = 4  # containers nested up to this deep are skipped by a single regex match
+
+
+def _skippable_pattern(levels: int) -> bytes:
+    # a run of bytes outside strings, strings and containers nested at most levels deep
+    run: bytes = rb'[^"\[\]{}]++|' + _STRING_PATTERN
+    for _ in range(levels):
+        run = rb'[^"\[\]{}]++|' + _STRING_PATTERN + rb'|\{(?:' + run + rb')*+\}|\[(?:' + run + rb')*+\]'
+    return rb'(?:' + run + rb')*+'
+
+
+_SKIPPABLE = re.compile(_skippable_pattern(_NESTING), re.DOTALL)
+_CONTAINER = re.compile(rb'\{' + _skippable_pattern(_NESTING - 1) + rb'\}|\[' + _skippable_pattern(_NESTING - 1) + rb'\]', re.DOTALL)
+
+
+def parse_path(path: str) -> list[PathPart]:
+    # 'a.b[3].c' -> ['a', 'b', 3, 'c'], keys holding dots or brackets can be quoted: a["x.y"]
+    parts: list[PathPart] = []
+    position: int = 0
+    while position < len(path):
+        if (match := _PATH_PART.match(path, position)) is None:
+            raise ValueError(f'Invalid JSON path "{path}" at position {position}.')
+        index, quoted, key = match.groups()
+        if index is not None:
+            parts.append(int(index))
+        else:
+            parts.append(json.loads(f'"{quoted}"') if quoted is not None else key)
+        position = match.end()
+    return parts
+
+
+def _string_end(buffer, position: int) -> int:
+    if (match := _STRING.match(buffer, position)) is None:
+        raise json.JSONDecodeError('Unterminated string', '', position)
+    return match.end()
+
+
+def _skip_whitespace(buffer, position: int) -> int:
+    return _WHITESPACE.match(buffer, position).end()
+
+
+def is_blank(buffer) -> bool:
+    return _skip_whitespace(buffer, 0) >= len(buffer)
+
+
+def _expect(buffer, position: int, token: bytes) -> int:
+    position = _skip_whitespace(buffer, position)
+    if buffer[position:position + 1] != token:
+        raise json.JSONDecodeError(f'Expecting {token.decode()!r}', bytes(buffer[position:position + 20]).decode(errors='replace'), 0)
+    return position + 1
+
+
+def skip_value(buffer, position: int) -> int:
+    # end of the value starting at position, without building it
+    position = _skip_whitespace(buffer, position)
+    first = buffer[position:position + 1]
+
+    if first == b'"':
+        return _string_end(buffer, position)
+
+    if first not in (b'{', b'['):
+        if (match := _SCALAR.match(buffer, position)) is None:
+            raise json.JSONDecodeError('Expecting value', '', position)
+        return match.end()
+
+    if (match := _CONTAINER.match(buffer, position)) is not None:
+        return match.end()
+
+    # deeper containers: one step per bracket, whatever lies between is consumed by one regex match
+    depth: int = 0
+    while True:
+        token = buffer[position:position + 1]
+        if token in (b'{', b'['):
+            depth += 1
+        elif token in (b'}', b']'):
+            depth -= 1
+        elif token == b'"':  # _SKIPPABLE stops at a string only if it is unterminated
+            raise json.JSONDecodeError('Unterminated string', '', position)
+        else:
+            raise json.JSONDecodeError('Unterminated container', '', position)
+        position += 1
+        if not depth:
+            return position
+        position = _SKIPPABLE.match(buffer, position).end()
+
+
+def decode_value(buffer, position: int) -> tuple[Any, int]:
+    start = _skip_whitespace(buffer, position)
+    end = skip_value(buffer, start)
+    return json.loads(bytes(buffer[start:end])), end
+
+
+def _read_key(buffer, position: int) -> tuple[str, int]:
+    position = _skip_whitespace(buffer, position)
+    if buffer[position:position + 1] != b'"':
+        raise json.JSONDecodeError('Expecting property name enclosed in double quotes', '', position)
+    end = _string_end(buffer, position)
+    raw = bytes(buffer[position + 1:end - 1])
+    key = json.loads(bytes(buffer[position:end])) if b'\\' in raw else raw.decode('utf-8')
+    return key, _expect(buffer, end, b':')
+
+
+MemberCursor = tuple[bytes, int, int]  # closing bracket, position after the last member read, members read
+
+
+def open_members(buffer, position: int) -> MemberCursor:
+    # cursor before the first member of the object / array starting at position
+    position = _skip_whitespace(buffer, position)
+    opening = buffer[position:position + 1]
+    if opening not in (b'{', b'['):
+        raise TypeError(NOT_A_CONTAINER)
+    return b'}' if opening == b'{' else b']', position + 1, 0
+
+
+def _next_member(buffer, cursor: MemberCursor) -> Optional[tuple[PathPart, int]]:
+    # (key or index, start of the value) of the member after cursor, None at the closing bracket
+    closing, position, index = cursor
+    position = _skip_whitespace(buffer, position)
+    if buffer[position:position + 1] == closing:
+        return None
+    if index:
+        position = _expect(buffer, position, b',')
+    if closing == b'}':
+        return _read_key(buffer, position)
+    return index, position
+
+
+def iter_members(buffer, position: int) -> Iterator[tuple[PathPart, int]]:
+    # (key or index, start of the value) of the object / array starting at position
+    # the caller consumes or skips each value, iteration resumes after it
+    closing, position, index = open_members(buffer, position)
+    while (member := _next_member(buffer, (closing, position, index))) is not None:
+        yield member
+        position = skip_value(buffer, member[1])
+        index += 1
+
+
+def read_members(buffer, cursor: MemberCursor, max_bytes: int) -> tuple[list[tuple[PathPart, Any]], Optional[MemberCursor]]:
+    # decoded members after cursor, until about max_bytes of the buffer were read
+    # returns them with the cursor to resume from in a later read, None once the container is closed
+    closing, position, index = cursor
+    members: list[tuple[PathPart, Any]] = []
+    first: int = position
+    while position - first < max_bytes:
+        if (member := _next_member(buffer, (closing, position, index))) is None:
+            return members, None
+        value, position = decode_value(buffer, member[1])
+        members.append((member[0], value))
+        index += 1
+    return members, (closing, position, index)
+
+
+def locate(buffer, parts: list[PathPart]) -> int:
+    # start of the value at parts, raises KeyError / IndexError if it is not there
+    # the scan stops at the first match, so a repeated key (left undefined by RFC 8259)
+    # resolves to its first occurrence here, while json.loads keeps the last one
+    position = _skip_whitespace(buffer, 0)
+    for part in parts:
+        for member, start in iter_members(buffer, position):
+            if member == part:
+                position = start
+                break
+        else:
+            raise (IndexError if isinstance(part, int) else KeyError)(part)
+    return position
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from ._file_abc import DictLikeFileABC, FileABC
+from ._utils import split_compression
+
+
+class KvFile(DictLikeFileABC):
+    # dict-like file kept in an sqlite table, so a keyed read / write costs O(log n) instead of a full rewrite
+    # values are stored as JSON, WAL mode lets other processes read while one writes
+
+    other_extensions = ('.sqlite',)
+
+    def __init__(self, file: str, compression_level: Optional[int] = None) -> None:
+        if split_compression(file)[1] is not None:
+            raise ValueError(f'KvFile cannot be compressed, got "{file}".')
+        super().__init__(file, compression_level)
+
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._connection is None:
+                self._connection = sqlite3.connect(self.file, timeout=30, isolation_level=None, check_same_thread=False)
+                self._connection.execute('PRAGMA journal_mode=WAL')
+                self._connection.execute('PRAGMA synchronous=NORMAL')
+                self._connection.execute('CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            return self._connection
+
+    def disconnect(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _query(self, sql: str, parameters: Iterable = ()) -> list[tuple]:
+        with self._lock:
+            return self.connection.execute(sql, tuple(parameters)).fetchall()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            connection = self.connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    _UPSERT: str = 'INSERT INTO kv (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value'
+
+    @staticmethod
+    def _rows(items: Iterable[tuple[Any, Any]]) -> list[tuple[str, str]]:
+        return [(str(key), json.dumps(value)) for key, value in items]
+
+    @property
+    def data(self) -> dict[str, Any]:
+        return {key: json.loads(value) for key, value in self._query('SELECT key, value FROM kv ORDER BY rowid')}
+
+    @property
+    def _content(self) -> dict[str, Any]:
+        return self.data
+
+    def rewrite(self, content: dict) -> None:
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM kv')
+            connection.executemany(KvFile._UPSERT, KvFile._rows(content.items()))
+
+    def clear(self) -> None:  # the file itself stays a valid database
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM kv')
+
+    def delete(self) -> None:
+        self.disconnect()
+        for suffix in ('-wal', '-shm'):
+            if os.path.isfile(self.file + suffix):
+                os.remove(self.file + suffix)
+        super().delete()
+
+    def duplicate(self, new_file_name: str = None) -> FileABC:
+        # the backup API also copies what is still in the WAL
+        new_file = self.__class__(new_file_name if new_file_name is not None else self._free_copy_name())
+        with self._lock:
+            self.connection.backup(new_file.connection)
+        new_file._invalidate()
+        return new_file
+
+    @property
+    def keys(self) -> list[str]:
+        return [key for key, in self._query('SELECT key FROM kv ORDER BY rowid')]
+
+    @property
+    def values(self) -> list[Any]:
+        return [json.loads(value) for value, in self._query('SELECT value FROM kv ORDER BY rowid')]
+
+    @property
+    def items(self) -> list[tuple[str, Any]]:
+        return list(self.data.items())
+
+    def __getitem__(self, item: str) -> Any:
+        if not (rows := self._query('SELECT value FROM kv WHERE key = ?', (str(item),))):
+            raise KeyError(item)
+        return json.loads(rows[0][0])
+
+    def get(self, item: str, subs_value: Any = None) -> Any:
+        try:
+            return self[item]
+        except KeyError:
+            return subs_value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._transaction() as connection:
+            connection.executemany(KvFile._UPSERT, KvFile._rows([(key, value)]))
+
+    def __delitem__(self, key: str) -> None:
+        with self._transaction() as connection:
+            if not connection.execute('DELETE FROM kv WHERE key = ?', (str(key),)).rowcount:
+                raise KeyError(key)
+
+    def remove(self, key: str) -> None:
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM kv WHERE key = ?', (str(key),))
+
+    def __contains__(self, item: str) -> bool:
+        return bool(self._query('SELECT 1 FROM kv WHERE key = ?', (str(item),)))
+
+    def __len__(self) -> int:
+        return self._query('SELECT COUNT(*) FROM kv')[0][0]
+
+    def __bool__(self) -> bool:
+        return bool(self._query('SELECT 1 FROM kv LIMIT 1'))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys)
+
+    def update(self, updates: dict[str, Any]) -> None:
+        with self._transaction() as connection:
+            connection.executemany(KvFile._UPSERT, KvFile._rows(updates.items()))
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._transaction() as connection:
+            rows = connection.execute('SELECT value FROM kv WHERE key = ?', (str(key),)).fetchall()
+            connection.execute('DELETE FROM kv WHERE key = ?', (str(key),))
+        return json.loads(rows[0][0]) if rows else default
+
+    def popitem(self) -> tuple[str, Any]:
+        with self._transaction() as connection:  # last inserted first, like dict.popitem
+            rows = connection.execute('SELECT rowid, key, value FROM kv ORDER BY rowid DESC LIMIT 1').fetchall()
+            if not rows:
+                raise KeyError('popitem(): KvFile is empty')
+            connection.execute('DELETE FROM kv WHERE rowid = ?', (rows[0][0],))
+        return rows[0][1], json.loads(rows[0][2])
+
+    def fromkeys(self, iterable: Iterable, value: Any = None) -> None:
+        with self._transaction() as connection:
+            connection.executemany(KvFile._UPSERT, KvFile._rows((key, value) for key in iterable))
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        with self._transaction() as connection:
+            connection.executemany('INSERT INTO kv (key, value) VALUES (?, ?) ON CONFLICT(key) DO NOTHING', KvFile._rows([(key, default)]))
+            return json.loads(connection.execute('SELECT value FROM kv WHERE key = ?', (str(key),)).fetchone()[0])
@@ -5,7 +5,7 @@ import re
 import subprocess
 from typing import Any
 
-from ._file_abc import FileABC
+from ._file_abc import FileABC, watch_cached
 
 from ._utils import Null
 
@@ -13,8 +13,9 @@ from ._utils import Null
 class PyFile(FileABC):
 
     @property
+    @watch_cached
     def code(self) -> str:
-        with open(self.file, 'r') as file:
+        with self._open('r') as file:
             code = file.read()
         return code
 
@@ -23,7 +24,7 @@ class PyFile(FileABC):
         return self.code
 
     def rewrite(self, content) -> None:
-        with open(self.file, 'w') as file:
+        with self._open('w') as file:
             file.write(content)
 
     @property
@@ -71,9 +72,12 @@ class PyFile(FileABC):
         except subprocess.CalledProcessError as e:
             print(f"Error running the file: {e}")
 
+    @staticmethod
+    def _format_write(line) -> str:
+        return f'\n{line}\n'
+
     def write(self, line) -> None:
-        with open(self.file, 'a') as file:
-            file.write(f'\n{line}\n')
+        self._append(PyFile._format_write(line))
 
     def add_base(self) -> None:
         self.write(
@@ -1,13 +1,22 @@
 from __future__ import annotations
+from collections.abc import Iterable
+from itertools import islice
+import os
+from typing import IO, Optional
 
-from ._file_abc import FileABC
+from ._file_abc import FileABC, watch_cached
+from ._index import WordIndex, Signature
+from ._utils import read_tail, text_encoding
 
 
 class TxtFile(FileABC):
 
+    _index: Optional[WordIndex] = None  # loaded word index, see find
+
     @property
+    @watch_cached
     def text(self) -> str:
-        with open(self.file, 'r') as f:
+        with self._open('r') as f:
             text = f.read()
         return text
 
@@ -35,8 +44,30 @@ class TxtFile(FileABC):
     def n_words(self) -> int:
         return len(self.words)
 
+    def head(self, n: int = 10) -> tuple[str, ...]:
+        # same as self.lines[:n] without reading past line n
+        with self._open('r') as file:
+            raw_lines = list(islice(file, n))
+        lines = [line[:-1] if line.endswith('\n') else line for line in raw_lines]
+        if len(lines) < n and (not raw_lines or raw_lines[-1].endswith('\n')):
+            lines.append('')  # str.split keeps the empty piece after the last newline
+        return tuple(lines)
+
+    def tail(self, n: int = 10) -> tuple[str, ...]:
+        # same as self.lines[-n:], seeks backwards from the end of the file
+        pieces, _ = read_tail(self.file, n, compression=self.compression)
+        encoding = text_encoding()
+        return tuple(piece.decode(encoding) for piece in pieces)
+
+    def preview(self, rows: int = 20) -> str:
+        lines = self.head(rows + 1)
+        return '\n'.join(lines[:rows]) + ('\n...' if len(lines) > rows else '')
+
     def get_line(self, index) -> str:
-        return self.lines[index]
+        lines = self.head(index + 1) if index >= 0 else self.tail(-index)
+        if len(lines) <= index or len(lines) < -index:
+            raise IndexError(f'Line index {index} out of range for TxtFile({self.file}).')
+        return lines[index] if index >= 0 else lines[0]
 
     def get_word(self, index) -> str:
         return self.words[index]
@@ -64,16 +95,104 @@ class TxtFile(FileABC):
         self.text = new_text
 
     def __contains__(self, item: str) -> bool:
-        return item in self.text
+        if '\n' in item or '\r' in item:  # line endings only match once decoded
+            return item in self.text
+        with self.mmap() as buffer:  # searched in place, nothing is decoded
+            return buffer.find(item.encode(text_encoding())) != -1
+
+    @staticmethod
+    def _format_write(*content, sep='\n', end=None) -> str:
+        to_write = ''.join([f'{part!s}{sep!s}' for part in content])
+        return f'{to_write}{str(end) if end is not None else ''}'
 
     def write(self, *content, sep='\n', end=None) -> None:
-        to_write = ''
-        for part in content:
-            to_write += f'{part!s}{sep!s}'
-        # to_write = to_write[:-len(str(sep))]
+        self._append(TxtFile._format_write(*content, sep=sep, end=end))
+
+    def _append(self, text: str, handle: Optional[IO] = None) -> None:
+        signature_before: Optional[Signature] = self._signature() if self.has_index else None
+        super()._append(text, handle)
+        if signature_before is not None:
+            self._extend_index(text, signature_before)
+
+    def clear(self) -> None:
+        super().clear()
+        if self.has_index:  # an empty file has an empty index
+            self._index = WordIndex.build('', self._signature())
+            self._index.save(self.index_file)
 
-        with open(self.file, 'a') as file:
-            file.write(f'{to_write}{str(end) if end is not None else ''}')
+    # word index
+
+    @property
+    def index_file(self) -> str:
+        return f'{self.file}.index'
+
+    @property
+    def has_index(self) -> bool:
+        return self._index is not None or os.path.isfile(self.index_file)
+
+    def _signature(self) -> Signature:
+        stat = os.stat(self.file)
+        return stat.st_size, stat.st_mtime_ns
+
+    def build_index(self) -> None:
+        self._index = WordIndex.build(self.text, self._signature())
+        self._index.save(self.index_file)
+
+    def delete(self) -> None:
+        self.drop_index()
+        super().delete()
+
+    def drop_index(self) -> None:
+        self._index = None
+        if os.path.isfile(self.index_file):
+            os.remove(self.index_file)
+
+    def _word_index(self) -> WordIndex:
+        # built once, then kept up to date by write; rebuilt only if the file changed behind our back
+        signature = self._signature()
+        if self._index is None or self._index.signature != signature:
+            self._index = WordIndex.load(self.index_file, signature)
+            if self._index is None:
+                self.build_index()
+        return self._index
+
+    def _extend_index(self, appended: str, signature_before: Signature) -> None:
+        if self._index is not None and self._index.signature == signature_before:
+            index = self._index
+        else:  # only the line count and the last line are needed to append
+            self._index = None
+            index = WordIndex.load_state(self.index_file)
+            if index is None or index.signature != signature_before:  # stale, rebuilt by the next find
+                self.drop_index()
+                return
+
+        delta = index.extend(appended)
+        index.signature = self._signature()
+        index.save_delta(self.index_file, delta)
+
+        if index.deltas >= WordIndex.COMPACT_AFTER:  # keeps the sidecar, and loading it, small
+            if index is self._index:
+                index.save(self.index_file)
+            else:
+                self._index = WordIndex.load(self.index_file, index.signature)
+
+    def find(self, term: str) -> list[int]:
+        # line numbers (as in get_line) holding every word of term, case insensitive
+        return self.find_all(WordIndex.tokenize(term))
+
+    def find_all(self, terms: Iterable[str], mode: str = 'and') -> list[int]:
+        index = self._word_index()
+        line_sets = [set(index.lines_of(word)) for term in terms for word in WordIndex.tokenize(term)]
+        if not line_sets:
+            return []
+
+        match mode.lower().strip():
+            case 'and':
+                return sorted(set.intersection(*line_sets))
+            case 'or':
+                return sorted(set.union(*line_sets))
+            case _:
+                raise ValueError(f'Invalid mode "{mode}" for TxtFile.find_all, expected "and" or "or".')
 
     def rewrite(self, *content, sep='\n', end=None) -> None:
         self.clear()
@@ -1,3 +1,7 @@
+import os
+import importlib
+import locale
+from collections import deque
 from pprint import pformat
 from functools import wraps
 from typing import (
@@ -8,6 +12,20 @@ from typing import (
 )
 
 from .null import Null  # access
+from .compression import (
+    COMPRESSIONS,
+    split_compression,
+    compression_suffix,
+    open_file
+)
+from .fastcopy import copy_file
+from .atomic import ReplacingFile
+from .fingerprint import (
+    Fingerprint,
+    fingerprint,
+    cached_fingerprint,
+    stat_signature
+)
 
 
 Matrix = Optional[list[list[Optional[Any]]]]
@@ -93,3 +111,63 @@ def base_value(value: str) -> Any:
     bool_none_value = bool_none_map.get(value.lower().strip(), Null)
 
     return bool_none_value if bool_none_value is not Null else value
+
+
+def require_module(module: str, feature: str) -> Any:
+    # optional dependencies are only imported by the features that need them
+    try:
+        return importlib.import_module(module)
+    except ModuleNotFoundError:
+        raise ImportError(f'{module} is not installed, therefore the {feature} function failed.') from None
+
+
+def text_encoding() -> str:
+    # what open() decodes with when no encoding is given
+    return locale.getpreferredencoding(False)
+
+
+def read_tail(
+        file: str,
+        n: int,
+        block_size: int = 1 << 16,
+        compression: Optional[str] = None
+) -> tuple[list[bytes], int]:
+    # last n b'\n' separated pieces of a file, read backwards in blocks
+    # returns the pieces and the byte offset the first one starts at
+    if compression is not None:
+        return _stream_tail(file, n, compression)
+    if n <= 0:
+        return [], os.path.getsize(file)
+
+    with open(file, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        blocks: list[bytes] = []  # last block first, joined once
+        newlines: int = 0
+        while position > 0 and newlines < n:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            blocks.append(block := f.read(step))
+            newlines += block.count(b'\n')  # only the new block is counted
+    buffer = b''.join(reversed(blocks))
+
+    pieces = buffer.split(b'\n')[-n:]
+    start = position + len(buffer) - sum(len(piece) + 1 for piece in pieces) + 1
+    return [piece.removesuffix(b'\r') for piece in pieces], start
+
+
+def _stream_tail(file: str, n: int, compression: str) -> tuple[list[bytes], int]:
+    # compressed streams cannot seek backwards cheaply, so they are read through once
+    # offsets are positions in the decompressed content
+    kept: deque[tuple[int, bytes]] = deque(maxlen=max(n, 0) + 1)
+    position: int = 0
+    with open_file(file, 'rb', compression) as f:
+        for line in f:
+            kept.append((position, line))
+            position += len(line)
+
+    entries = [(start, line.removesuffix(b'\n').removesuffix(b'\r')) for start, line in kept]
+    if not kept or kept[-1][1].endswith(b'\n'):
+        entries.append((position, b''))  # the piece after the last newline
+    entries = entries[-n:] if n > 0 else []
+    return [line for _, line in entries], entries[0][0] if entries else position
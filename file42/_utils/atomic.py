@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+import secrets
+import stat
+from typing import (
+    IO,
+    Callable,
+    Any
+)
+
+
+class ReplacingFile:
+    # handle on a temporary file next to the target, moved over the target on close
+    # the target is never truncated in place, readers that mapped or opened it keep the old content,
+    # and a block that raises leaves the target as it was
+
+    def __init__(self, file: str, opener: Callable[[str], IO]) -> None:
+        self.target: str = os.path.realpath(file)  # a symlink keeps pointing to the replaced file
+        directory, name = os.path.split(self.target)
+        self.temporary: str = os.path.join(directory, f'.{name}.{secrets.token_hex(4)}.tmp')
+        with open(self.temporary, 'x'):  # created with the usual permissions (umask applied)
+            pass
+        try:
+            os.chmod(self.temporary, stat.S_IMODE(os.stat(self.target).st_mode))
+        except FileNotFoundError:
+            pass
+        self._handle: IO = opener(self.temporary)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._handle, name)
+
+    def __enter__(self) -> ReplacingFile:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def __iter__(self):
+        return iter(self._handle)
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        os.replace(self.temporary, self.target)
+
+    def discard(self) -> None:
+        self._handle.close()
+        if os.path.exists(self.temporary):
+            os.remove(self.temporary)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+from typing import (
+    IO,
+    Optional,
+    Any
+)
+
+
+COMPRESSIONS: dict[str, str] = {  # suffix -> compression
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'lzma'
+}
+
+
+def split_compression(file_name: str) -> tuple[str, Optional[str]]:
+    # 'events.csv.gz' -> ('events.csv', 'gzip')
+    for suffix, compression in COMPRESSIONS.items():
+        if file_name.endswith(suffix):
+            return file_name[:-len(suffix)], compression
+    return file_name, None
+
+
+def compression_suffix(compression: Optional[str]) -> str:
+    for suffix, name in COMPRESSIONS.items():
+        if name == compression:
+            return suffix
+    return ''
+
+
+def open_file(
+        file: str,
+        mode: str = 'r',
+        compression: Optional[str] = None,
+        level: Optional[int] = None,
+        **kwargs: Any
+) -> IO:
+    # open() for plain files, the matching stdlib module for compressed ones
+    # text modes stay text modes, the compressed openers default to binary
+    if compression is None:
+        return open(file, mode, **kwargs)
+
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+
+    match compression:
+        case 'gzip':
+            return gzip.open(file, mode, compresslevel=9 if level is None else level, **kwargs)
+        case 'bz2':
+            return bz2.open(file, mode, compresslevel=9 if level is None else level, **kwargs)
+        case 'lzma':
+            return lzma.open(file, mode, preset=None if 'r' in mode else level, **kwargs)  # reading takes no preset
+        case _:
+            raise ValueError(f'Unknown compression "{compression}", expected one of {list(COMPRESSIONS.values())}.')
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from typing import BinaryIO
+
+from .atomic import ReplacingFile
+
+_FICLONE: int = 0x40049409  # ioctl from <linux/fs.h>, shares the extents on btrfs / xfs / ...
+
+
+def _reflink(source: BinaryIO, destination: BinaryIO) -> bool:
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import fcntl
+        fcntl.ioctl(destination.fileno(), _FICLONE, source.fileno())
+        return True
+    except OSError:  # not supported by the filesystem, or across filesystems
+        return False
+
+
+def copy_file(source: str, destination: str) -> None:
+    # byte-exact copy done by the kernel when it can be:
+    # reflink, then copy_file_range, then sendfile, then a plain buffered copy
+    # the copy replaces destination on success, readers of the old destination are not cut short
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f'{source!r} and {destination!r} are the same file.')
+
+    with open(source, 'rb') as src, ReplacingFile(destination, lambda file: open(file, 'wb')) as dst:
+        if _reflink(src, dst):
+            return
+
+        size: int = os.fstat(src.fileno()).st_size
+        copied: int = 0
+
+        for kernel_copy in (_copy_file_range, _sendfile):
+            try:
+                while copied < size:
+                    if not (step := kernel_copy(src.fileno(), dst.fileno(), copied, size - copied)):
+                        break
+                    copied += step
+                if copied >= size:
+                    return
+            except (AttributeError, OSError):  # missing syscall, or refused for these two files
+                continue
+
+        src.seek(copied)
+        dst.seek(copied)
+        dst.truncate()
+        shutil.copyfileobj(src, dst)
+
+
+def _copy_file_range(source_fd: int, destination_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(source_fd, destination_fd, count, offset, offset)
+
+
+def _sendfile(source_fd: int, destination_fd: int, offset: int, count: int) -> int:
+    os.lseek(destination_fd, offset, os.SEEK_SET)
+    return os.sendfile(destination_fd, source_fd, offset, count)
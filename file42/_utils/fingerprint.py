@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import xxhash  # NOQA
+    _xxhash_usable: bool = True
+except ModuleNotFoundError:
+    _xxhash_usable: bool = False
+
+
+Fingerprint = tuple[int, str]  # size, hex digest of the bytes on disk
+StatSignature = tuple[int, int, int, int]  # device, inode, size, mtime
+
+_BLOCK_SIZE: int = 1 << 20
+
+_CACHE_SIZE: int = 4096  # digests kept, least recently used ones are dropped first
+_digests: OrderedDict[str, tuple[StatSignature, str]] = OrderedDict()  # path -> stat signature and digest of its last hash
+_digests_lock = threading.Lock()
+
+
+def stat_signature(file: str) -> StatSignature:
+    stat = os.stat(file)
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def fingerprint(file: str) -> Fingerprint:
+    # one stat per call, the digest itself is only computed again once the file changed
+    path, signature = os.path.abspath(file), stat_signature(file)
+    if (digest := _known_digest(path, signature)) is None:
+        digest = _digest(path)
+        with _digests_lock:
+            _digests[path] = signature, digest
+            _digests.move_to_end(path)
+            if len(_digests) > _CACHE_SIZE:
+                _digests.popitem(last=False)
+    return signature[2], digest
+
+
+def cached_fingerprint(file: str) -> Optional[Fingerprint]:
+    # the fingerprint if it is already known for the file as it is now, None instead of hashing it
+    path, signature = os.path.abspath(file), stat_signature(file)
+    digest = _known_digest(path, signature)
+    return None if digest is None else (signature[2], digest)
+
+
+def _known_digest(path: str, signature: StatSignature) -> Optional[str]:
+    with _digests_lock:
+        known = _digests.get(path)
+        if known is None or known[0] != signature:
+            return None
+        _digests.move_to_end(path)
+        return known[1]
+
+
+def _digest(file: str) -> str:
+    hasher = xxhash.xxh3_128() if _xxhash_usable else hashlib.blake2b(digest_size=16)
+    buffer = bytearray(_BLOCK_SIZE)
+    view = memoryview(buffer)
+    with open(file, 'rb', buffering=0) as f:
+        while read := f.readinto(buffer):
+            hasher.update(view[:read])
+    return hasher.hexdigest()
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import traceback
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Optional
+)
+
+if TYPE_CHECKING:
+    from ._file_abc import FileABC
+
+
+WatchCallback = Callable[['FileABC', str], None]  # called with the handle and the event name
+# events: 'created', 'modified', 'moved', 'deleted', and 'overflow' when the kernel dropped events
+
+# inotify constants from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+_DIR_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _event_name(mask: int) -> Optional[str]:
+    if mask & _IN_DELETE:
+        return 'deleted'
+    if mask & _IN_MOVED_FROM:
+        return 'moved'
+    if mask & (_IN_CREATE | _IN_MOVED_TO):  # also how atomic "write then rename" saves show up
+        return 'created'
+    if mask & (_IN_MODIFY | _IN_CLOSE_WRITE):
+        return 'modified'
+    return None
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class Watcher:
+    # pushes modify / move / delete events of watched files to their handles
+    # Linux inotify through ctypes, stat polling everywhere else (or with polling=True)
+    # parent directories are watched so atomic replaces are seen as well
+
+    _default: Optional[Watcher] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, reload: bool = False, polling: bool = False, interval: float = 1.0) -> None:
+        self.reload: bool = reload  # re-read the content in the background after each event
+        self.interval: float = interval  # polling period, and the stop latency of the inotify loop
+
+        self._libc: Optional[ctypes.CDLL] = None if polling else _load_inotify()
+        self._fd: Optional[int] = None
+        self._dir_watches: dict[int, str] = {}  # wd -> directory
+        self._dir_refs: dict[str, int] = {}  # directory -> number of watched files in it
+        self._handles: dict[str, list[tuple[FileABC, Optional[WatchCallback]]]] = {}  # path -> handles
+        self._stats: dict[str, Optional[tuple[int, int, int]]] = {}  # polling only
+
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def default(cls) -> Watcher:
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._libc is not None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, file: FileABC, callback: Optional[WatchCallback] = None) -> None:
+        path = os.path.abspath(file.file)
+        with self._lock:
+            if path not in self._handles:
+                self._handles[path] = []
+                self._stats[path] = Watcher._stat(path)
+                self._add_dir(os.path.dirname(path))
+            self._handles[path].append((file, callback))
+        file._watchers.add(self)  # NOQA
+        file._invalidate()  # NOQA
+        self.start()
+
+    def remove(self, file: FileABC) -> None:
+        path = os.path.abspath(file.file)
+        with self._lock:
+            entries = [entry for entry in self._handles.get(path, []) if entry[0] is not file]
+            if entries:
+                self._handles[path] = entries
+            elif path in self._handles:
+                del self._handles[path]
+                del self._stats[path]
+                self._remove_dir(os.path.dirname(path))
+        file._watchers.discard(self)  # NOQA
+        file._invalidate()  # NOQA
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running:
+                return
+            if self._libc is not None and self._fd is None:
+                self._open_inotify()
+            self._stop.clear()
+            target = self._inotify_loop if self._libc is not None else self._polling_loop
+            self._thread = threading.Thread(target=target, name='file42-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            for path, entries in list(self._handles.items()):
+                for file, _ in entries:
+                    file._watchers.discard(self)  # NOQA
+                    file._invalidate()  # NOQA
+            self._handles.clear()
+            self._stats.clear()
+            self._dir_refs.clear()
+            self._dir_watches.clear()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self) -> Watcher:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}: {'inotify' if self.uses_inotify else 'polling'}, {len(self._handles)} files'
+
+    # inotify
+
+    def _open_inotify(self) -> None:
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:  # out of instances, fall back
+            self._libc = None
+            return
+        self._fd = fd
+        for directory in self._dir_refs:
+            self._add_inotify_watch(directory)
+
+    def _add_inotify_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _DIR_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f'inotify_add_watch failed: {os.strerror(error)}', directory)
+        self._dir_watches[wd] = directory
+
+    def _add_dir(self, directory: str) -> None:
+        self._dir_refs[directory] = self._dir_refs.get(directory, 0) + 1
+        if self._dir_refs[directory] == 1 and self._fd is not None:
+            self._add_inotify_watch(directory)
+
+    def _remove_dir(self, directory: str) -> None:
+        self._dir_refs[directory] -= 1
+        if self._dir_refs[directory]:
+            return
+        del self._dir_refs[directory]
+        for wd, watched in list(self._dir_watches.items()):
+            if watched == directory:
+                del self._dir_watches[wd]
+                if self._fd is not None:
+                    self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _inotify_loop(self) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._fd], [], [], self.interval)
+            if not readable:
+                continue
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            self._handle_events(buffer)
+
+    def _handle_events(self, buffer: bytes) -> None:
+        events: dict[str, str] = {}  # one event per path and batch, in arrival order
+        overflowed: bool = False
+        lost: list[str] = []  # directories whose watch the kernel removed
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:  # events were lost, any watched file may have changed
+                overflowed = True
+                continue
+            if mask & _IN_IGNORED:  # the directory is gone (our own inotify_rm_watch forgets wd first)
+                with self._lock:
+                    if wd in self._dir_watches:
+                        lost.append(self._dir_watches.pop(wd))
+                continue
+            if not name or wd not in self._dir_watches:
+                continue
+            if (event := _event_name(mask)) is not None:
+                path = os.path.join(self._dir_watches[wd], os.fsdecode(name))
+                events.pop(path, None)
+                events[path] = event
+
+        for path, event in events.items():
+            self._dispatch(path, event)
+        if overflowed:
+            with self._lock:
+                paths = list(self._handles)
+            for path in paths:
+                self._dispatch(path, 'overflow')
+        for directory in lost:
+            self._lose_directory(directory)
+
+    def _lose_directory(self, directory: str) -> None:
+        # nothing reports changes in it anymore, its handles are told and stop being watched (and cached)
+        with self._lock:
+            paths = [path for path in self._handles if os.path.dirname(path) == directory]
+        for path in paths:
+            self._dispatch(path, 'deleted')
+            with self._lock:
+                entries = list(self._handles.get(path, ()))
+            for file, _ in entries:
+                self.remove(file)
+
+    # polling
+
+    @staticmethod
+    def _stat(path: str) -> Optional[tuple[int, int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _polling_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                paths = list(self._stats.items())
+            for path, old in paths:
+                new = Watcher._stat(path)
+                if new == old:
+                    continue
+                with self._lock:
+                    if path in self._stats:
+                        self._stats[path] = new
+                if new is None:
+                    self._dispatch(path, 'deleted')
+                elif old is None:
+                    self._dispatch(path, 'created')
+                else:
+                    self._dispatch(path, 'modified')
+
+    # both
+
+    def _dispatch(self, path: str, event: str) -> None:
+        with self._lock:
+            entries = list(self._handles.get(path, ()))
+
+        for file, callback in entries:
+            file._invalidate()  # NOQA
+            if self.reload and event != 'deleted':
+                try:
+                    file._reload()  # NOQA
+                except Exception:  # NOQA  e.g. EOFError of a half written .gz, the next access reads it again
+                    traceback.print_exc()
+            if callback is not None:
+                try:
+                    callback(file, event)
+                except Exception:  # NOQA  a failing callback must not kill the watcher
+                    traceback.print_exc()
@@ -0,0 +1,75 @@
+import pytest
+
+from file42 import CsvFile
+
+
+@pytest.fixture
+def csv_file(tmp_path) -> CsvFile:
+    return CsvFile(str(tmp_path / 'data.csv'))
+
+
+@pytest.mark.parametrize('rows', [
+    [['a', 'b'], [1, 'x'], [2, 'y, z'], [3, 'x\ny\nz']],
+    [['a', 'b'], [1, 'x\ny'], [2, 'say ""hi""'], [3, 'q\n"\nq']],
+    [['a', 'b'], [1, 'plain'], [2, '"'], [3, 'y, "z"']],
+])
+def test_tail_matches_data(csv_file, rows):
+    csv_file.rewrite(rows)
+    data = csv_file.data
+    for n in range(1, len(rows) + 2):
+        assert csv_file.tail(n) == data[-n:]
+
+
+def test_tail_with_literal_quotes_in_unquoted_fields(csv_file):
+    with open(csv_file.file, 'w') as f:
+        f.write('a,b\n1,5" disk\n2,"x\ny"\n3,7" disk\n')
+    data = csv_file.data
+    for n in range(1, 5):
+        assert csv_file.tail(n) == data[-n:]
+
+
+@pytest.mark.parametrize('new', [True, 1.0])
+def test_edit_writes_values_that_only_compare_equal(csv_file, new):
+    csv_file.rewrite([['a', 'b'], [1, 2]])
+    with csv_file.edit() as table:
+        table[1, 0] = new
+        table['b'] = ['b', float(new)]
+    assert csv_file.data[1] == [new, float(new)]
+    assert type(csv_file.data[1][0]) is type(new)
+
+
+def test_replace_writes_values_that_only_compare_equal(csv_file):
+    csv_file.rewrite([['a', 'b'], [1, 2]])
+    csv_file.replace(1, True)
+    assert csv_file.data[1] == [True, 2]
+
+
+def _write(csv_file: CsvFile, text: str) -> None:
+    with open(csv_file.file, 'w', newline='') as f:
+        f.write(text)
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    # every file goes through the process pool, however small
+    monkeypatch.setattr(CsvFile, '_PARALLEL_MIN_SIZE', 0)
+
+
+@pytest.mark.parametrize('workers', [2, 3, 4, 7])
+@pytest.mark.parametrize('record', [
+    '{0},5" disk,7" floppy\n',  # literal quotes in unquoted fields
+    '{0},"say ""hi""","a ""b"", c"\n',  # "" escapes
+    '{0},plain,"x, y"\r\n',  # CRLF line endings
+    '{0},"first\nsecond\nthird","a\r\nb"\n',  # multi-line fields for the cuts to land in
+    '{0},5" disk,"line\n""quoted""\nline"\n',  # all of it at once
+])
+def test_parse_matches_data(csv_file, parallel, workers, record):
+    _write(csv_file, 'id,a,b\n' + ''.join(record.format(index) for index in range(500)))
+    assert len(csv_file._byte_ranges(workers)) > 1  # NOQA  the pool really splits the file
+    assert csv_file.parse(workers) == csv_file.data
+
+
+def test_parse_cuts_inside_multi_line_fields(csv_file, parallel):
+    # one huge multi-line field: every byte cut lands inside it
+    _write(csv_file, 'id,text\n1,"' + 'line\n' * 10_000 + '"\n2,end\n')
+    assert csv_file.parse(4) == csv_file.data
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from file42 import TxtFile
+
+
+def test_mapping_survives_a_rewrite_from_another_handle(tmp_path):
+    # run apart: reading a mapping of a file truncated in place kills the interpreter (SIGBUS)
+    script = textwrap.dedent(f'''
+        from file42 import TxtFile
+        file = TxtFile({str(tmp_path / 'mapped.txt')!r})
+        file.rewrite('x' * 100_000)
+        with file.mmap() as buffer:
+            TxtFile(file.file).rewrite('short')
+            assert buffer[-2:] == b'x\\n'
+        assert file.text == 'short\\n'
+    ''')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_failed_rewrite_keeps_the_old_content(tmp_path):
+    file = TxtFile(str(tmp_path / 'kept.txt'))
+    file.rewrite('old')
+    with pytest.raises(ValueError):
+        with file._open('w') as handle:  # NOQA
+            handle.write('partial')
+            raise ValueError
+    assert file.text == 'old\n'
+    assert os.listdir(tmp_path) == ['kept.txt']
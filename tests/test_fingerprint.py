@@ -0,0 +1,25 @@
+from importlib import import_module
+
+from file42 import TxtFile, find_duplicates
+
+fingerprints = import_module('file42._utils.fingerprint')  # the package exports the function under that name
+
+
+def test_digest_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprints, '_CACHE_SIZE', 8)
+    monkeypatch.setattr(fingerprints, '_digests', type(fingerprints._digests)())  # NOQA
+    paths = []
+    for index in range(20):
+        (path := tmp_path / f'{index}.txt').write_text('same')
+        paths.append(str(path))
+
+    assert [sorted(group) for group in find_duplicates(paths)] == [sorted(paths)]
+    assert len(fingerprints._digests) == 8  # NOQA
+
+
+def test_cached_fingerprint_only_answers_from_the_cache(tmp_path):
+    file = TxtFile(str(tmp_path / 'a.txt'))
+    file.rewrite('content')
+    assert fingerprints.cached_fingerprint(file.file) is None
+    known = file.fingerprint()
+    assert fingerprints.cached_fingerprint(file.file) == known
@@ -0,0 +1,94 @@
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from file42 import JsonFile
+from file42._jsonpath import skip_value
+
+
+@pytest.fixture
+def large_json(tmp_path) -> JsonFile:
+    # a small value first, then a large sibling the lookups must not walk through
+    file = JsonFile(str(tmp_path / 'large.json'))
+    document = {
+        'first': {'x': 1},
+        'arr': [{'id': index, 'name': f'item {index}', 'tags': ['a', 'b']} for index in range(300_000)],
+        'last': {'y': 2}
+    }
+    with open(file.file, 'w') as f:
+        json.dump(document, f)
+    return file
+
+
+def test_get_path_stops_at_the_first_match(large_json):
+    start = time.perf_counter()
+    assert large_json.get_path('first.x') == 1
+    assert time.perf_counter() - start < 0.5
+
+
+def test_get_path_does_not_read_past_the_match(tmp_path):
+    file = JsonFile(str(tmp_path / 'truncated.json'))
+    with open(file.file, 'w') as f:
+        f.write('{"first": {"x": 1}, "rest": [1, 2, ')  # broken after the match
+    assert file.get_path('first.x') == 1
+
+
+def test_repeated_keys_resolve_to_the_first_occurrence(tmp_path):
+    file = JsonFile(str(tmp_path / 'repeated.json'))
+    with open(file.file, 'w') as f:
+        f.write('{"a": 1, "a": 2}')
+    assert file.get_path('a') == 1
+
+
+def test_get_path_skips_a_large_sibling(large_json):
+    start = time.perf_counter()
+    with open(large_json.file, 'rb') as f:
+        expected = json.loads(f.read())['last']['y']
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert large_json.get_path('last.y') == expected
+    assert time.perf_counter() - start < 3 * parse_time  # skipping must not cost much more than parsing
+
+
+@pytest.mark.parametrize('value', [
+    {'a': [1, {'b': 'x]}"', 'c': [[[[[[1]]]]]]}], 'd': '\\'},
+    [{'k': [{'k': [{'k': [{'k': [{'k': []}]}]}]}]}, '[{', '\\"'],
+    {'deep': [[[[[[[[{'x': 'y'}]]]]]]]]},
+])
+def test_skip_value_matches_the_decoder(value):
+    encoded = json.dumps(value).encode()
+    assert skip_value(b' ' + encoded + b', 1', 0) == len(encoded) + 1
+
+
+def test_iter_items_yields_before_reading_the_whole_array(large_json):
+    tracemalloc.start()
+    try:
+        items = large_json.iter_items('arr')
+        assert next(items) == (0, {'id': 0, 'name': 'item 0', 'tags': ['a', 'b']})
+        assert tracemalloc.get_traced_memory()[1] < 16 << 20
+    finally:
+        tracemalloc.stop()
+    assert sum(1 for _ in items) == 300_000 - 1
+
+
+def test_iter_items_raises_if_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(JsonFile, '_ITER_BATCH_BYTES', 64)
+    file = JsonFile(str(tmp_path / 'changing.json'))
+    file.rewrite({str(index): index for index in range(100)})
+    with pytest.raises(RuntimeError):
+        for key, _ in file.iter_items():
+            file[key] = 'changed'
+
+
+def test_iter_items_decode_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(JsonFile, '_ITER_BATCH_BYTES', 64)
+    file = JsonFile(str(tmp_path / 'broken.json'))
+    with open(file.file, 'w') as f:
+        f.write('{"a": [' + ', '.join(['1'] * 100) + ', ]')
+
+    assert list(file.iter_items()) == []  # broken before anything was handed out: an empty document
+    with pytest.raises(json.JSONDecodeError):  # broken after items were handed out
+        list(file.iter_items('a'))
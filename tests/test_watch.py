@@ -0,0 +1,46 @@
+import shutil
+import struct
+import time
+
+import pytest
+
+from file42 import TxtFile
+from file42._watch import Watcher
+
+
+@pytest.fixture
+def watcher():
+    with Watcher(interval=0.05) as watcher:
+        yield watcher
+
+
+def test_queue_overflow_invalidates_every_handle(tmp_path, watcher):
+    events = []
+    file = TxtFile(str(tmp_path / 'a.txt'))
+    file.rewrite('old')
+    file.watch(lambda handle, event: events.append(event), watcher)
+    assert file.text == 'old\n'  # cached from now on
+
+    with open(file.file, 'w') as f:  # a change whose event was lost
+        f.write('new')
+    watcher._handle_events(struct.pack('iIII', -1, 0x4000, 0, 0))  # NOQA  IN_Q_OVERFLOW
+
+    assert 'overflow' in events
+    assert file.text == 'new'
+
+
+@pytest.mark.skipif(not Watcher().uses_inotify, reason='inotify only')
+def test_removed_directory_stops_watching_its_files(tmp_path, watcher):
+    events = []
+    directory = tmp_path / 'gone'
+    directory.mkdir()
+    file = TxtFile(str(directory / 'a.txt'))
+    file.watch(lambda handle, event: events.append(event), watcher)
+
+    shutil.rmtree(directory)
+    deadline = time.monotonic() + 5
+    while file.is_watched and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert not file.is_watched
+    assert 'deleted' in events